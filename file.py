@@ -1,8 +1,10 @@
 import os
+import stat
 import sys
 import time
 import threading
 from pathlib import Path
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 class ColorfulProgressBar:
@@ -52,6 +54,408 @@ class ColorfulProgressBar:
         sys.stdout.write(f"\r{ColorfulProgressBar.color_text(desc, 'cyan')}: {bar} {ColorfulProgressBar.color_text('✓ 完成', 'green')}\n")
         sys.stdout.flush()
 
+class DeviceConcurrencyController:
+    """单个设备的自适应并发控制器，根据scandir延迟和吞吐量动态调整并发数"""
+    
+    WINDOW_SECONDS = 0.5        # 每个调整窗口的时长
+    LATENCY_TOLERANCE = 3.0     # 单项延迟超过近期基线的倍数时降低并发
+    LATENCY_HISTORY = 8         # 延迟基线只取最近若干窗口中的最小值，冷热缓存切换后会重新测量
+    PROBE_GAIN = 1.05           # 增加并发后吞吐量至少要提升的比例，否则回退
+    PROBE_KEEP = 0.95           # 降低并发后吞吐量至少要保持的比例，否则回退
+    PROBE_COOLDOWN = 4          # 试探失败并回退后等待的窗口数
+    
+    def __init__(self, device, roots, max_workers=16, initial_workers=2, clock=time.perf_counter):
+        self.device = device
+        self.roots = list(roots)
+        self.max_workers = max(1, max_workers)
+        self.min_workers = 1
+        self.limit = min(max(1, initial_workers), self.max_workers)
+        self.peak_limit = self.limit
+        self.active = 0
+        self.executor = None
+        self._cond = threading.Condition()
+        self._clock = clock
+        
+        # 累计统计
+        self.scandir_calls = 0
+        self.entries = 0
+        self.total_latency = 0.0
+        
+        # 当前窗口统计
+        self._window_start = clock()
+        self._window_calls = 0
+        self._window_entries = 0
+        self._window_latency = 0.0
+        self._window_peak_active = 0
+        
+        # 爬山法状态：每次只改变1，下一个窗口根据吞吐量决定保留还是回退
+        self._latency_history = deque(maxlen=self.LATENCY_HISTORY)
+        self._direction = 1             # 下一次试探的方向
+        self._last_change = None        # (变化量, 变化前窗口的吞吐量)
+        self._cooldown = 0
+        
+        # 实际占用槽位数的时间加权累计，用于计算有效并发
+        self._started_at = self._window_start
+        self._finished_at = None
+        self._active_since = self._window_start
+        self._active_area = 0.0
+    
+    def start(self):
+        """创建该设备专属的线程池"""
+        now = self._clock()
+        self._started_at = self._window_start = self._active_since = now
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self.executor
+    
+    def shutdown(self, cancel=False):
+        """关闭线程池并结束统计；cancel为True时丢弃尚未开始的任务"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=cancel)
+            self.executor = None
+        with self._cond:
+            self._track_active(self._clock())
+            self._finished_at = self._active_since
+    
+    def acquire(self):
+        """获取一个scandir并发槽位"""
+        with self._cond:
+            while self.active >= self.limit:
+                self._cond.wait()
+            self._track_active(self._clock())
+            self.active += 1
+            self._window_peak_active = max(self._window_peak_active, self.active)
+    
+    def release(self, latency, entries):
+        """释放槽位并记录本次scandir的延迟和项目数"""
+        with self._cond:
+            now = self._clock()
+            self._track_active(now)
+            self.active -= 1
+            self.scandir_calls += 1
+            self.entries += entries
+            self.total_latency += latency
+            self._window_calls += 1
+            self._window_entries += entries
+            self._window_latency += latency
+            self._adjust(now)
+            self._cond.notify_all()
+    
+    def _track_active(self, now):
+        """累计占用槽位数的时间加权值（需持有锁）"""
+        self._active_area += self.active * (now - self._active_since)
+        self._active_since = now
+    
+    def _set_limit(self, new_limit):
+        """修改并发上限"""
+        self.limit = new_limit
+        self.peak_limit = max(self.peak_limit, new_limit)
+    
+    def _adjust(self, now):
+        """窗口结束时根据吞吐量和延迟调整并发数（需持有锁）"""
+        elapsed = now - self._window_start
+        if elapsed < self.WINDOW_SECONDS or self._window_calls == 0:
+            return
+        
+        throughput = self._window_entries / elapsed
+        latency_per_entry = self._window_latency / max(1, self._window_entries)
+        self._latency_history.append(latency_per_entry)
+        baseline = min(self._latency_history)
+        saturated = self._window_peak_active >= self.limit
+        
+        delta = 0
+        if self._last_change is not None:
+            # 评估上一次调整：没有带来收益就回退，并换个方向等待下一次试探
+            change, before = self._last_change
+            self._last_change = None
+            if change > 0 and throughput < before * self.PROBE_GAIN:
+                delta = -1
+            elif change < 0 and throughput < before * self.PROBE_KEEP:
+                delta = 1
+            if delta:
+                self._direction = -change
+                self._cooldown = self.PROBE_COOLDOWN
+        elif self._cooldown > 0:
+            self._cooldown -= 1
+        elif latency_per_entry > baseline * self.LATENCY_TOLERANCE and self.limit > self.min_workers:
+            # 设备开始排队，延迟明显高于近期基线
+            delta = -1
+            self._direction = -1
+            self._last_change = (delta, throughput)
+        elif self._direction > 0:
+            if saturated and self.limit < self.max_workers:
+                # 槽位已用满，试探更高并发
+                delta = 1
+                self._last_change = (delta, throughput)
+            elif self.limit >= self.max_workers:
+                self._direction = -1
+        elif self.limit > self.min_workers:
+            # 试探更低并发（例如机械硬盘寻道）
+            delta = -1
+            self._last_change = (delta, throughput)
+        else:
+            self._direction = 1
+        
+        new_limit = max(self.min_workers, min(self.max_workers, self.limit + delta))
+        if new_limit != self.limit:
+            self._set_limit(new_limit)
+        else:
+            self._last_change = None
+        
+        self._window_start = now
+        self._window_calls = 0
+        self._window_entries = 0
+        self._window_latency = 0.0
+        self._window_peak_active = self.active
+    
+    def effective_concurrency(self):
+        """实际同时进行的scandir数量的时间加权平均值（上限另见 limit/peak_limit）"""
+        end = self._finished_at if self._finished_at is not None else self._clock()
+        duration = end - self._started_at
+        if duration <= 0:
+            return 0.0
+        area = self._active_area + self.active * (end - self._active_since)
+        return area / duration
+    
+    def stats(self):
+        """返回该设备的统计信息"""
+        end = self._finished_at if self._finished_at is not None else self._clock()
+        duration = end - self._started_at
+        return {
+            'device': self.device,
+            'roots': list(self.roots),
+            'effective_concurrency': self.effective_concurrency(),
+            'final_concurrency': self.limit,
+            'peak_concurrency': self.peak_limit,
+            'max_workers': self.max_workers,
+            'scandir_calls': self.scandir_calls,
+            'entries': self.entries,
+            'throughput': self.entries / duration if duration > 0 else 0.0,
+            'avg_latency_ms': self.total_latency / self.scandir_calls * 1000 if self.scandir_calls else 0.0,
+        }
+
+class DeviceScheduler:
+    """按底层设备(st_dev)对搜索根目录分组，每个设备使用独立的自适应线程池"""
+    
+    DEFAULT_MAX_WORKERS = 16
+    
+    def __init__(self, roots, max_workers=None):
+        groups = {}
+        root_devices = []
+        for root in roots:
+            try:
+                device = os.stat(root).st_dev
+            except OSError:
+                continue  # 跳过不存在或无法访问的根目录
+            groups.setdefault(device, []).append(root)
+            root_devices.append((root, device))
+        
+        max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+        controllers = {device: DeviceConcurrencyController(device, device_roots, max_workers)
+                       for device, device_roots in groups.items()}
+        self.controllers = list(controllers.values())
+        
+        # 按search_roots原始顺序排列的 (根目录, 所属设备控制器)
+        self.root_assignments = [(root, controllers[device]) for root, device in root_devices]
+    
+    def __enter__(self):
+        for controller in self.controllers:
+            controller.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        # 异常（如Ctrl+C）退出时不再执行排队中的任务
+        for controller in self.controllers:
+            controller.shutdown(cancel=exc_type is not None)
+        return False
+    
+    def stats(self):
+        """返回所有设备的统计信息"""
+        return [controller.stats() for controller in self.controllers]
+
+class NGramIndex:
+    """名称的n-gram倒排索引，用于快速查找相似名称"""
+    
+    def __init__(self, n=3):
+        self.n = n
+        self.names = []        # id -> 名称
+        self.keys = []         # id -> 归一化后的名称
+        self.paths = []        # id -> 第一次遇到该名称的路径
+        self._ids = {}         # 名称 -> id
+        self._postings = {}    # gram -> [id, ...]
+        self._stems = {}       # 去掉扩展名的归一化名称 -> [id, ...]
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def __contains__(self, name):
+        return name in self._ids
+    
+    def grams(self, key):
+        """返回带首尾填充的n-gram集合"""
+        padding = '\0' * (self.n - 1)
+        padded = f"{padding}{key}{padding}"
+        return {padded[i:i + self.n] for i in range(len(padded) - self.n + 1)}
+    
+    def add(self, name, path=None):
+        """加入一个名称，重复名称只记录一次"""
+        if name in self._ids:
+            return
+        with self._lock:
+            if name in self._ids:
+                return
+            name_id = len(self.names)
+            key = name.casefold()
+            self._ids[name] = name_id
+            self.names.append(name)
+            self.keys.append(key)
+            self.paths.append(path)
+            for gram in self.grams(key):
+                self._postings.setdefault(gram, []).append(name_id)
+            self._stems.setdefault(os.path.splitext(key)[0], []).append(name_id)
+    
+    @staticmethod
+    def bounded_edit_distance(a, b, limit):
+        """只计算对角线附近宽度为2*limit+1的带状区域，超过limit时提前返回None"""
+        if abs(len(a) - len(b)) > limit:
+            return None
+        width = 2 * limit + 1
+        overflow = limit + 1
+        # 带内下标k对应第j = i + k - limit列
+        previous = [j if 0 <= j <= min(len(b), limit) else overflow
+                    for j in range(-limit, limit + 1)]
+        for i in range(1, len(a) + 1):
+            current = [overflow] * width
+            row_min = overflow
+            for k in range(width):
+                j = i + k - limit
+                if j < 0 or j > len(b):
+                    continue
+                if j == 0:
+                    value = i
+                else:
+                    value = previous[k] + (a[i - 1] != b[j - 1])
+                    if k + 1 < width:
+                        value = min(value, previous[k + 1] + 1)
+                    if k > 0:
+                        value = min(value, current[k - 1] + 1)
+                current[k] = min(value, overflow)
+                row_min = min(row_min, current[k])
+            if row_min > limit:
+                return None
+            previous = current
+        distance = previous[len(b) - len(a) + limit]
+        return distance if distance <= limit else None
+    
+    def search(self, query, top_k=5, max_distance=None):
+        """返回与query最相似的前top_k个名称 [(名称, 编辑距离, 路径), ...]
+        
+        编辑距离上限默认随名称长度增长 (max(2, 长度//3))，并限制在 (|Q|-1)//n 以内，
+        保证候选项至少共享一个gram，因此很短的名称只会匹配到很近的名称。
+        """
+        key = query.casefold()
+        query_grams = self.grams(key)
+        if max_distance is None:
+            max_distance = max(2, len(key) // 3)
+        max_distance = min(max_distance, (len(query_grams) - 1) // self.n)
+        
+        # q-gram引理：编辑距离不超过d时，至少共享 |Q|-n*d 个gram
+        threshold = len(query_grams) - self.n * max_distance
+        
+        # 前缀过滤：只需从最稀有的 |Q|-T+1 个倒排表中产生候选项
+        postings = sorted((self._postings.get(gram, ()) for gram in query_grams), key=len)
+        candidates = set()
+        for posting in postings[:len(query_grams) - threshold + 1]:
+            candidates.update(posting)
+        
+        # 主名相同、仅扩展名不同的候选项不受距离上限限制
+        stem = os.path.splitext(key)[0]
+        stem_ids = set(self._stems.get(stem, ())) if stem else set()
+        
+        matches = []
+        for name_id in candidates | stem_ids:
+            if self.names[name_id] == query:
+                continue
+            candidate_key = self.keys[name_id]
+            if name_id in stem_ids:
+                limit = max(len(key), len(candidate_key))
+            else:
+                if abs(len(candidate_key) - len(key)) > max_distance:
+                    continue
+                if len(query_grams & self.grams(candidate_key)) < threshold:
+                    continue
+                limit = max_distance
+            distance = self.bounded_edit_distance(key, candidate_key, limit)
+            if distance is not None:
+                matches.append((distance, self.names[name_id], self.paths[name_id]))
+        
+        matches.sort()
+        return [(name, distance, path) for distance, name, path in matches[:top_k]]
+
+class MetadataFilter:
+    """基于scandir缓存数据的类型/大小/修改时间过滤器"""
+    
+    def __init__(self, kind=None, min_size=None, max_size=None, modified_within_days=None):
+        if kind not in (None, 'file', 'dir'):
+            raise ValueError(f"未知的类型 '{kind}'")
+        if (min_size is not None and min_size < 0) or (max_size is not None and max_size < 0):
+            raise ValueError("大小不能为负数")
+        if min_size is not None and max_size is not None and min_size > max_size:
+            raise ValueError("最小大小不能大于最大大小")
+        if modified_within_days is not None and modified_within_days <= 0:
+            raise ValueError("修改天数必须大于0")
+        
+        self.kind = kind                    # 'file'、'dir' 或 None(不限)
+        self.min_size = min_size            # 字节，只对文件生效
+        self.max_size = max_size
+        self.modified_within_days = modified_within_days
+        self.min_mtime = time.time() - modified_within_days * 86400 if modified_within_days is not None else None
+    
+    @property
+    def active(self):
+        """是否设置了任何过滤条件"""
+        return bool(self.kind) or self.needs_stat
+    
+    @property
+    def needs_stat(self):
+        """是否需要大小或修改时间（Windows上scandir已缓存，Linux上需要一次stat）"""
+        return self.min_size is not None or self.max_size is not None or self.min_mtime is not None
+    
+    def matches(self, entry):
+        """判断DirEntry是否满足条件，先做免费的类型判断，再读取缓存的stat"""
+        try:
+            is_dir = entry.is_dir()
+            if self.kind == 'dir' and not is_dir:
+                return False
+            if self.kind == 'file' and (is_dir or not entry.is_file()):
+                return False
+            if not self.needs_stat:
+                return True
+            st = entry.stat()
+        except OSError:
+            return False
+        if not is_dir:
+            if self.min_size is not None and st.st_size < self.min_size:
+                return False
+            if self.max_size is not None and st.st_size > self.max_size:
+                return False
+        if self.min_mtime is not None and st.st_mtime < self.min_mtime:
+            return False
+        return True
+    
+    def describe(self):
+        """过滤条件的文字描述"""
+        parts = []
+        if self.kind:
+            parts.append('仅文件' if self.kind == 'file' else '仅文件夹')
+        if self.min_size is not None:
+            parts.append(f"大于 {self.min_size / 1024 / 1024:g} MB")
+        if self.max_size is not None:
+            parts.append(f"小于 {self.max_size / 1024 / 1024:g} MB")
+        if self.modified_within_days is not None:
+            parts.append(f"最近 {self.modified_within_days:g} 天内修改")
+        return ', '.join(parts) if parts else '无'
+
 class SystemSearcher:
     def __init__(self, target_path):
         self.target_path = Path(target_path)
@@ -61,13 +465,35 @@ class SystemSearcher:
             'folders_found': [],
             'folders_not_found': [],
             'files_found': [],
-            'files_not_found': []
+            'files_not_found': [],
+            # 系统中存在同名项目，但不满足过滤条件: [(名称, 路径), ...]
+            'folders_filtered_out': [],
+            'files_filtered_out': []
         }
         
         # 进度计数器
         self.progress_folders = 0
         self.progress_files = 0
         
+        # 每个设备的并发统计
+        self.device_stats = []
+        
+        # 模糊匹配：遍历时建立名称索引，为不存在的项目查找相似名称
+        self.fuzzy_enabled = False
+        self.fuzzy_top_k = 5
+        self.folder_name_index = NGramIndex()
+        self.file_name_index = NGramIndex()
+        self.near_matches = {
+            'folders': {},
+            'files': {}
+        }
+        
+        # 元数据过滤与按需加载
+        self.metadata_filter = None     # MetadataFilter，同时作用于目标项目和搜索命中
+        self.show_metadata = False      # 是否在结果中显示大小和修改时间
+        self.metadata = {}              # 路径 -> {'size', 'mtime', 'is_dir'}
+        self._metadata_lock = threading.Lock()
+        
         # 用于显示当前搜索的信息
         self.current_search_items = {
             'folders': {},
@@ -128,7 +554,9 @@ class SystemSearcher:
         
         print(ColorfulProgressBar.color_text(f"📂 正在读取目录: ", 'green') + ColorfulProgressBar.color_text(str(self.target_path), 'cyan'))
         
-        items = list(self.target_path.iterdir())
+        # scandir 返回的条目已缓存类型信息，判断文件夹/文件不需要额外的stat
+        with os.scandir(self.target_path) as it:
+            items = list(it)
         total = len(items)
         
         if total == 0:
@@ -136,10 +564,14 @@ class SystemSearcher:
             return
         
         for i, item in enumerate(items, 1):
-            if item.is_dir():
-                self.folders.append(item.name)
-            elif item.is_file():
-                self.files.append(item.name)
+            if self.metadata_filter is None or self.metadata_filter.matches(item):
+                try:
+                    if item.is_dir():
+                        self.folders.append(item.name)
+                    elif item.is_file():
+                        self.files.append(item.name)
+                except OSError:
+                    pass
             
             # 显示进度
             ColorfulProgressBar.display_progress("扫描目录", i, total, 'green')
@@ -154,9 +586,109 @@ class SystemSearcher:
         # 显示目录内容
         self.display_directory_contents()
     
-    def search_folder_in_system(self, folder_name, thread_id=0):
-        """在整个Windows系统中搜索文件夹"""
-        for root in self.search_roots:
+    def walk_directory(self, top, controller=None, stop_event=None):
+        """基于scandir的目录遍历，在os.walk输出之外附带该目录的DirEntry列表，并向设备控制器报告延迟"""
+        stack = [str(top)]
+        while stack:
+            if stop_event is not None and stop_event.is_set():
+                return
+            dirpath = stack.pop()
+            
+            if controller is not None:
+                controller.acquire()
+            start = time.perf_counter()
+            entries = []
+            try:
+                with os.scandir(dirpath) as it:
+                    entries = list(it)
+            except OSError:
+                continue  # 跳过没有权限的目录
+            finally:
+                if controller is not None:
+                    controller.release(time.perf_counter() - start, len(entries))
+            
+            dirnames, filenames, walk_into = [], [], []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    dirnames.append(entry.name)
+                    try:
+                        if not entry.is_symlink():
+                            walk_into.append(entry.path)
+                    except OSError:
+                        pass
+                else:
+                    filenames.append(entry.name)
+            
+            if self.fuzzy_enabled:
+                # 每个目标都会重复遍历，已收录的名称不再拼接路径
+                for name in dirnames:
+                    if name not in self.folder_name_index:
+                        self.folder_name_index.add(name, os.path.join(dirpath, name))
+                for name in filenames:
+                    if name not in self.file_name_index:
+                        self.file_name_index.add(name, os.path.join(dirpath, name))
+            
+            yield dirpath, dirnames, filenames, entries
+            stack.extend(reversed(walk_into))
+    
+    def entry_matches(self, entries, name):
+        """检查名称命中的条目是否满足过滤条件，只对命中项读取元数据"""
+        if self.metadata_filter is None or not self.metadata_filter.active:
+            return True
+        for entry in entries:
+            if entry.name == name:
+                if not self.metadata_filter.matches(entry):
+                    return False
+                if self.metadata_filter.needs_stat:
+                    # 过滤时已读取的stat直接记入缓存，之后显示元数据无需再次读取
+                    self.remember_metadata(entry.path, entry.stat(), entry.is_dir())
+                return True
+        return False
+    
+    def remember_metadata(self, path, st, is_dir):
+        """记录一个路径的元数据"""
+        with self._metadata_lock:
+            self.metadata[path] = {'size': st.st_size, 'mtime': st.st_mtime, 'is_dir': is_dir}
+    
+    def load_metadata(self, paths, batch_size=256):
+        """按需分批读取路径的元数据，已缓存的路径不会重复读取"""
+        missing = [path for path in dict.fromkeys(paths) if path not in self.metadata]
+        
+        def stat_batch(batch):
+            for path in batch:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                self.remember_metadata(path, st, stat.S_ISDIR(st.st_mode))
+        
+        if missing:
+            batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+            with ThreadPoolExecutor(max_workers=min(4, len(batches))) as executor:
+                list(executor.map(stat_batch, batches))
+        return {path: self.metadata.get(path) for path in paths}
+    
+    @staticmethod
+    def format_metadata(meta):
+        """格式化元数据"""
+        if not meta:
+            return "元数据不可用"
+        modified = time.strftime('%Y-%m-%d %H:%M', time.localtime(meta['mtime']))
+        if meta['is_dir']:
+            return f"修改于 {modified}"
+        return f"{meta['size'] / 1024 / 1024:.2f} MB, 修改于 {modified}"
+    
+    def search_folder_in_system(self, folder_name, thread_id=0, roots=None, controller=None, stop_event=None):
+        """在整个Windows系统中搜索文件夹
+        
+        返回 (True, 路径)；只找到不满足过滤条件的同名项目时返回 (False, 该路径)；都没有时返回 (False, None)
+        """
+        filtered_path = None
+        for root in (self.search_roots if roots is None else roots):
             root_path = Path(root)
             if not root_path.exists():
                 continue
@@ -171,7 +703,11 @@ class SystemSearcher:
                       end='', flush=True)
             
             try:
-                for dirpath, dirnames, _ in os.walk(root_path):
+                for dirpath, dirnames, _, entries in self.walk_directory(root_path, controller, stop_event):
+                    if folder_name in dirnames and not self.entry_matches(entries, folder_name):
+                        if filtered_path is None:
+                            filtered_path = str(Path(dirpath) / folder_name)
+                        continue
                     if folder_name in dirnames:
                         # 找到时显示
                         if self.show_search_items:
@@ -186,17 +722,22 @@ class SystemSearcher:
             except Exception:
                 continue
         
-        # 未找到时显示
-        if self.show_search_items:
+        # 未找到时显示（按设备调度时由调度方汇总后显示）
+        if self.show_search_items and roots is None:
+            status = ColorfulProgressBar.color_text('⚠️  不满足过滤条件', 'magenta') if filtered_path else ColorfulProgressBar.color_text('❌ 未找到', 'red')
             print(f"\r{ColorfulProgressBar.color_text(f'线程{thread_id}:', 'magenta')} "
-                  f"{ColorfulProgressBar.color_text('❌ 未找到', 'red')} "
+                  f"{status} "
                   f"{ColorfulProgressBar.color_text(f'📁 {folder_name}', 'yellow')}")
         
-        return False, None
+        return False, filtered_path
     
-    def search_file_in_system(self, file_name, thread_id=0):
-        """在整个Windows系统中搜索文件"""
-        for root in self.search_roots:
+    def search_file_in_system(self, file_name, thread_id=0, roots=None, controller=None, stop_event=None):
+        """在整个Windows系统中搜索文件
+        
+        返回 (True, 路径)；只找到不满足过滤条件的同名项目时返回 (False, 该路径)；都没有时返回 (False, None)
+        """
+        filtered_path = None
+        for root in (self.search_roots if roots is None else roots):
             root_path = Path(root)
             if not root_path.exists():
                 continue
@@ -211,7 +752,11 @@ class SystemSearcher:
                       end='', flush=True)
             
             try:
-                for dirpath, _, filenames in os.walk(root_path):
+                for dirpath, _, filenames, entries in self.walk_directory(root_path, controller, stop_event):
+                    if file_name in filenames and not self.entry_matches(entries, file_name):
+                        if filtered_path is None:
+                            filtered_path = str(Path(dirpath) / file_name)
+                        continue
                     if file_name in filenames:
                         # 找到时显示
                         if self.show_search_items:
@@ -226,13 +771,14 @@ class SystemSearcher:
             except Exception:
                 continue
         
-        # 未找到时显示
-        if self.show_search_items:
+        # 未找到时显示（按设备调度时由调度方汇总后显示）
+        if self.show_search_items and roots is None:
+            status = ColorfulProgressBar.color_text('⚠️  不满足过滤条件', 'magenta') if filtered_path else ColorfulProgressBar.color_text('❌ 未找到', 'red')
             print(f"\r{ColorfulProgressBar.color_text(f'线程{thread_id}:', 'magenta')} "
-                  f"{ColorfulProgressBar.color_text('❌ 未找到', 'red')} "
+                  f"{status} "
                   f"{ColorfulProgressBar.color_text(f'📄 {file_name}', 'yellow')}")
         
-        return False, None
+        return False, filtered_path
     
     def update_folder_progress(self):
         """更新文件夹搜索进度"""
@@ -257,6 +803,8 @@ class SystemSearcher:
         print(f"{ColorfulProgressBar.color_text('搜索根目录:', 'green')} {ColorfulProgressBar.color_text(str(len(self.search_roots)), 'cyan')}")
         print(f"{ColorfulProgressBar.color_text('显示搜索路径:', 'green')} {ColorfulProgressBar.color_text('是' if self.show_search_paths else '否', 'cyan')}")
         print(f"{ColorfulProgressBar.color_text('显示搜索项目:', 'green')} {ColorfulProgressBar.color_text('是' if self.show_search_items else '否', 'cyan')}")
+        if self.metadata_filter is not None and self.metadata_filter.active:
+            print(f"{ColorfulProgressBar.color_text('过滤条件:', 'green')} {ColorfulProgressBar.color_text(self.metadata_filter.describe(), 'cyan')}")
         
         if self.search_roots:
             print(f"\n{ColorfulProgressBar.color_text('搜索路径列表:', 'green')}")
@@ -268,8 +816,70 @@ class SystemSearcher:
         print(ColorfulProgressBar.color_text("\n" + "="*70, 'cyan'))
         print(ColorfulProgressBar.color_text("开始搜索... 按 Ctrl+C 可中断搜索", 'yellow'))
     
-    def search_items_parallel(self, max_workers=4):
-        """并行搜索文件夹和文件，使用彩色进度条"""
+    def schedule_device_search(self, scheduler, names, search_func, icon):
+        """按根目录将搜索任务分派到所属设备的线程池，逐个返回已完成的 (名称, 是否找到, 路径或None)
+        
+        与顺序搜索结果一致：路径取search_roots中最靠前的命中根目录。
+        未找到但存在不满足过滤条件的同名项目时，返回 (名称, False, 该路径)。
+        """
+        assignments = scheduler.root_assignments
+        if not assignments:
+            for name in names:
+                yield name, False, None
+            return
+        
+        futures = {}
+        pending = {}
+        stop_events = {}
+        found_paths = {}
+        filtered_paths = {}
+        thread_counter = 0
+        for name in names:
+            pending[name] = len(assignments)
+            stop_events[name] = [threading.Event() for _ in assignments]
+            found_paths[name] = {}
+            filtered_paths[name] = {}
+            for index, (root, controller) in enumerate(assignments):
+                thread_counter += 1
+                thread_id = thread_counter % controller.max_workers
+                future = controller.executor.submit(search_func, name, thread_id,
+                                                    [root], controller, stop_events[name][index])
+                futures[future] = (name, index)
+        
+        try:
+            for future in as_completed(futures):
+                name, index = futures[future]
+                try:
+                    found, path = future.result()
+                    if found:
+                        found_paths[name][index] = path
+                        # 排在后面的根目录不会再影响结果，可以提前结束
+                        for event in stop_events[name][index + 1:]:
+                            event.set()
+                    elif path is not None:
+                        filtered_paths[name][index] = path
+                except Exception as e:
+                    print(ColorfulProgressBar.color_text(f"搜索 '{name}' 时出错: {e}", 'red'))
+                
+                pending[name] -= 1
+                if pending[name] == 0:
+                    found = bool(found_paths[name])
+                    paths = found_paths[name] or filtered_paths[name]
+                    path = paths[min(paths)] if paths else None
+                    if not found and self.show_search_items:
+                        status = ColorfulProgressBar.color_text('⚠️  不满足过滤条件', 'magenta') if path else ColorfulProgressBar.color_text('❌ 未找到', 'red')
+                        print(f"\r{status} "
+                              f"{ColorfulProgressBar.color_text(f'{icon} {name}', 'yellow')}")
+                    yield name, found, path
+        except BaseException:
+            # 中断（Ctrl+C）或提前停止迭代时，让正在遍历的任务在下一个目录处结束
+            for events in stop_events.values():
+                for event in events:
+                    event.set()
+            raise
+    
+    def search_items_parallel(self, max_workers=None):
+        """并行搜索文件夹和文件，按设备自适应调整并发，使用彩色进度条"""
         total_items = len(self.folders) + len(self.files)
         
         # 如果没有项目需要搜索，直接返回
@@ -286,72 +896,55 @@ class SystemSearcher:
         self.progress_folders = 0
         self.progress_files = 0
         
-        # 线程ID分配器
-        thread_counter = 0
-        
-        # 搜索文件夹
-        if self.folders:
-            print(ColorfulProgressBar.color_text(f"\n📁 开始搜索文件夹 ({len(self.folders)}个)...", 'magenta'))
-            
-            # 启动进度条线程
-            progress_thread = threading.Thread(target=self.update_folder_progress)
-            progress_thread.daemon = True
-            progress_thread.start()
-            
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_folder = {}
-                for folder in self.folders:
-                    thread_counter += 1
-                    thread_id = thread_counter % max_workers if max_workers > 0 else thread_counter
-                    future = executor.submit(self.search_folder_in_system, folder, thread_id)
-                    future_to_folder[future] = folder
+        # 每个设备一个线程池，max_workers 为单个设备的并发上限
+        with DeviceScheduler(self.search_roots, max_workers) as scheduler:
+            # 搜索文件夹
+            if self.folders:
+                print(ColorfulProgressBar.color_text(f"\n📁 开始搜索文件夹 ({len(self.folders)}个)...", 'magenta'))
                 
-                for future in as_completed(future_to_folder):
-                    folder = future_to_folder[future]
-                    try:
-                        found, path = future.result()
-                        if found:
-                            self.results['folders_found'].append((folder, path))
-                        else:
-                            self.results['folders_not_found'].append(folder)
-                    except Exception as e:
-                        print(ColorfulProgressBar.color_text(f"搜索文件夹 '{folder}' 时出错: {e}", 'red'))
-                    finally:
-                        self.progress_folders += 1
-            
-            ColorfulProgressBar.complete_progress("文件夹搜索", len(self.folders), 'cyan')
-        
-        # 搜索文件
-        if self.files:
-            print(ColorfulProgressBar.color_text(f"\n📄 开始搜索文件 ({len(self.files)}个)...", 'magenta'))
-            
-            # 启动进度条线程
-            progress_thread = threading.Thread(target=self.update_file_progress)
-            progress_thread.daemon = True
-            progress_thread.start()
-            
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_file = {}
-                for file in self.files:
-                    thread_counter += 1
-                    thread_id = thread_counter % max_workers if max_workers > 0 else thread_counter
-                    future = executor.submit(self.search_file_in_system, file, thread_id)
-                    future_to_file[future] = file
+                # 启动进度条线程
+                progress_thread = threading.Thread(target=self.update_folder_progress)
+                progress_thread.daemon = True
+                progress_thread.start()
                 
-                for future in as_completed(future_to_file):
-                    file = future_to_file[future]
-                    try:
-                        found, path = future.result()
-                        if found:
-                            self.results['files_found'].append((file, path))
-                        else:
-                            self.results['files_not_found'].append(file)
-                    except Exception as e:
-                        print(ColorfulProgressBar.color_text(f"搜索文件 '{file}' 时出错: {e}", 'red'))
-                    finally:
-                        self.progress_files += 1
+                for folder, found, path in self.schedule_device_search(scheduler, self.folders,
+                                                                       self.search_folder_in_system, '📁'):
+                    if found:
+                        self.results['folders_found'].append((folder, path))
+                    elif path is not None:
+                        self.results['folders_filtered_out'].append((folder, path))
+                    else:
+                        self.results['folders_not_found'].append(folder)
+                    self.progress_folders += 1
+                
+                ColorfulProgressBar.complete_progress("文件夹搜索", len(self.folders), 'cyan')
             
-            ColorfulProgressBar.complete_progress("文件搜索", len(self.files), 'yellow')
+            # 搜索文件
+            if self.files:
+                print(ColorfulProgressBar.color_text(f"\n📄 开始搜索文件 ({len(self.files)}个)...", 'magenta'))
+                
+                # 启动进度条线程
+                progress_thread = threading.Thread(target=self.update_file_progress)
+                progress_thread.daemon = True
+                progress_thread.start()
+                
+                for file, found, path in self.schedule_device_search(scheduler, self.files,
+                                                                     self.search_file_in_system, '📄'):
+                    if found:
+                        self.results['files_found'].append((file, path))
+                    elif path is not None:
+                        self.results['files_filtered_out'].append((file, path))
+                    else:
+                        self.results['files_not_found'].append(file)
+                    self.progress_files += 1
+                
+                ColorfulProgressBar.complete_progress("文件搜索", len(self.files), 'yellow')
+        
+        self.device_stats = scheduler.stats()
+        
+        # 为不存在的项目查找相似名称
+        if self.fuzzy_enabled:
+            self.find_near_matches()
         
         end_time = time.time()
         
@@ -362,6 +955,27 @@ class SystemSearcher:
         # 显示搜索统计信息
         self.display_search_statistics(start_time, end_time)
     
+    def find_near_matches(self):
+        """使用n-gram索引为不存在的文件夹和文件查找相似名称"""
+        self.near_matches['folders'] = {
+            folder: self.folder_name_index.search(folder, self.fuzzy_top_k)
+            for folder in self.results['folders_not_found']
+        }
+        self.near_matches['files'] = {
+            file: self.file_name_index.search(file, self.fuzzy_top_k)
+            for file in self.results['files_not_found']
+        }
+        return self.near_matches
+    
+    def display_near_matches(self, name, kind):
+        """显示某个不存在项目的相似名称"""
+        for candidate, distance, path in self.near_matches[kind].get(name, []):
+            print(f"       {ColorfulProgressBar.color_text('≈', 'yellow')} "
+                  f"{ColorfulProgressBar.color_text(candidate, 'cyan')} "
+                  f"{ColorfulProgressBar.color_text(f'(距离 {distance})', 'white')} "
+                  f"{ColorfulProgressBar.color_text('→', 'white')} "
+                  f"{ColorfulProgressBar.color_text(str(path), 'yellow')}")
+    
     def display_search_statistics(self, start_time, end_time):
         """显示搜索统计信息"""
         print(ColorfulProgressBar.color_text("\n" + "="*70, 'cyan'))
@@ -374,16 +988,19 @@ class SystemSearcher:
         # 文件夹统计
         folders_found = len(self.results['folders_found'])
         folders_not_found = len(self.results['folders_not_found'])
+        folders_filtered_out = len(self.results['folders_filtered_out'])
         folders_total = len(self.folders)
         
         # 文件统计
         files_found = len(self.results['files_found'])
         files_not_found = len(self.results['files_not_found'])
+        files_filtered_out = len(self.results['files_filtered_out'])
         files_total = len(self.files)
         
         # 总体统计
         total_found = folders_found + files_found
         total_not_found = folders_not_found + files_not_found
+        total_filtered_out = folders_filtered_out + files_filtered_out
         total_items = folders_total + files_total
         
         print(f"\n{ColorfulProgressBar.color_text('⏱️  搜索耗时:', 'green')} {ColorfulProgressBar.color_text(f'{search_time:.2f} 秒', 'cyan')}")
@@ -396,6 +1013,9 @@ class SystemSearcher:
                   f"({ColorfulProgressBar.color_text(f'{folders_found/folders_total*100:.1f}%', 'green')})")
             print(f"  {ColorfulProgressBar.color_text('❌ 不存在的:', 'red')} {ColorfulProgressBar.color_text(f'{folders_not_found}', 'cyan')} "
                   f"({ColorfulProgressBar.color_text(f'{folders_not_found/folders_total*100:.1f}%', 'red')})")
+            if folders_filtered_out:
+                print(f"  {ColorfulProgressBar.color_text('⚠️  存在但不满足过滤条件:', 'magenta')} {ColorfulProgressBar.color_text(f'{folders_filtered_out}', 'cyan')} "
+                      f"({ColorfulProgressBar.color_text(f'{folders_filtered_out/folders_total*100:.1f}%', 'magenta')})")
         else:
             print(f"  {ColorfulProgressBar.color_text('✅ 存在的:', 'green')} {ColorfulProgressBar.color_text('0', 'cyan')} (0%)")
             print(f"  {ColorfulProgressBar.color_text('❌ 不存在的:', 'red')} {ColorfulProgressBar.color_text('0', 'cyan')} (0%)")
@@ -408,6 +1028,9 @@ class SystemSearcher:
                   f"({ColorfulProgressBar.color_text(f'{files_found/files_total*100:.1f}%', 'green')})")
             print(f"  {ColorfulProgressBar.color_text('❌ 不存在的:', 'red')} {ColorfulProgressBar.color_text(f'{files_not_found}', 'cyan')} "
                   f"({ColorfulProgressBar.color_text(f'{files_not_found/files_total*100:.1f}%', 'red')})")
+            if files_filtered_out:
+                print(f"  {ColorfulProgressBar.color_text('⚠️  存在但不满足过滤条件:', 'magenta')} {ColorfulProgressBar.color_text(f'{files_filtered_out}', 'cyan')} "
+                      f"({ColorfulProgressBar.color_text(f'{files_filtered_out/files_total*100:.1f}%', 'magenta')})")
         else:
             print(f"  {ColorfulProgressBar.color_text('✅ 存在的:', 'green')} {ColorfulProgressBar.color_text('0', 'cyan')} (0%)")
             print(f"  {ColorfulProgressBar.color_text('❌ 不存在的:', 'red')} {ColorfulProgressBar.color_text('0', 'cyan')} (0%)")
@@ -420,6 +1043,9 @@ class SystemSearcher:
                   f"({ColorfulProgressBar.color_text(f'{total_found/total_items*100:.1f}%', 'green')})")
             print(f"  {ColorfulProgressBar.color_text('❌ 不存在的:', 'red')} {ColorfulProgressBar.color_text(f'{total_not_found}', 'cyan')} "
                   f"({ColorfulProgressBar.color_text(f'{total_not_found/total_items*100:.1f}%', 'red')})")
+            if total_filtered_out:
+                print(f"  {ColorfulProgressBar.color_text('⚠️  存在但不满足过滤条件:', 'magenta')} {ColorfulProgressBar.color_text(f'{total_filtered_out}', 'cyan')} "
+                      f"({ColorfulProgressBar.color_text(f'{total_filtered_out/total_items*100:.1f}%', 'magenta')})")
         else:
             print(f"  {ColorfulProgressBar.color_text('✅ 存在的:', 'green')} {ColorfulProgressBar.color_text('0', 'cyan')} (0%)")
             print(f"  {ColorfulProgressBar.color_text('❌ 不存在的:', 'red')} {ColorfulProgressBar.color_text('0', 'cyan')} (0%)")
@@ -430,6 +1056,23 @@ class SystemSearcher:
             print(f"\n{ColorfulProgressBar.color_text('⚡ 搜索效率:', 'green')} "
                   f"{ColorfulProgressBar.color_text(f'{items_per_second:.1f} 个项目/秒', 'cyan')}")
         
+        # 设备并发统计
+        if self.device_stats:
+            print(ColorfulProgressBar.color_text("\n💽 设备并发统计:", 'green'))
+            for device_stat in self.device_stats:
+                device_label = f"设备 {device_stat['device']}:"
+                concurrency = f"{device_stat['effective_concurrency']:.2f}"
+                calls = f"{device_stat['scandir_calls']} 次"
+                print(f"  {ColorfulProgressBar.color_text(device_label, 'white')} "
+                      f"{ColorfulProgressBar.color_text('; '.join(device_stat['roots']), 'blue')}")
+                print(f"    {ColorfulProgressBar.color_text('有效并发:', 'white')} "
+                      f"{ColorfulProgressBar.color_text(concurrency, 'cyan')} "
+                      f"(最终 {device_stat['final_concurrency']}, 峰值 {device_stat['peak_concurrency']}, 上限 {device_stat['max_workers']})")
+                print(f"    {ColorfulProgressBar.color_text('scandir:', 'white')} "
+                      f"{ColorfulProgressBar.color_text(calls, 'cyan')}, "
+                      f"平均延迟 {device_stat['avg_latency_ms']:.2f} ms, "
+                      f"吞吐量 {device_stat['throughput']:.1f} 项/秒")
+        
         print(ColorfulProgressBar.color_text("\n" + "="*70, 'cyan'))
     
     def display_detailed_results(self):
@@ -439,6 +1082,7 @@ class SystemSearcher:
             print(ColorfulProgressBar.color_text(f"\n📁 不存在的文件夹 ({len(self.results['folders_not_found'])}个):", 'red'))
             for i, folder in enumerate(self.results['folders_not_found'], 1):
                 print(f"  {ColorfulProgressBar.color_text(f'{i:3}.', 'white')} {ColorfulProgressBar.color_text(folder, 'red')}")
+                self.display_near_matches(folder, 'folders')
         else:
             print(ColorfulProgressBar.color_text(f"\n📁 不存在的文件夹 (0个)", 'red'))
         
@@ -447,12 +1091,29 @@ class SystemSearcher:
             print(ColorfulProgressBar.color_text(f"\n📄 不存在的文件 ({len(self.results['files_not_found'])}个):", 'red'))
             for i, file in enumerate(self.results['files_not_found'], 1):
                 print(f"  {ColorfulProgressBar.color_text(f'{i:3}.', 'white')} {ColorfulProgressBar.color_text(file, 'red')}")
+                self.display_near_matches(file, 'files')
         else:
             print(ColorfulProgressBar.color_text(f"\n📄 不存在的文件 (0个)", 'red'))
         
+        # 显示存在但不满足过滤条件的项目
+        for key, title in (('folders_filtered_out', "📁 存在但不满足过滤条件的文件夹"),
+                           ('files_filtered_out', "📄 存在但不满足过滤条件的文件")):
+            if self.results[key]:
+                print(ColorfulProgressBar.color_text(f"\n{title} ({len(self.results[key])}个):", 'magenta'))
+                for i, (name, path) in enumerate(self.results[key], 1):
+                    print(f"  {ColorfulProgressBar.color_text(f'{i:3}.', 'white')} "
+                          f"{ColorfulProgressBar.color_text(name, 'magenta')} "
+                          f"{ColorfulProgressBar.color_text('→', 'white')} "
+                          f"{ColorfulProgressBar.color_text(path, 'yellow')}")
+        
         # 询问是否显示存在的项目
         show_found = input(ColorfulProgressBar.color_text(f"\n是否显示在系统中存在的项目？(y/n, 回车默认n): ", 'yellow')).strip().lower()
         if show_found == 'y':
+            # 只为将要显示的项目分批读取元数据
+            if self.show_metadata:
+                shown = self.results['folders_found'][:10] + self.results['files_found'][:10]
+                self.load_metadata([path for _, path in shown])
+            
             # 显示存在的文件夹
             if self.results['folders_found']:
                 print(ColorfulProgressBar.color_text(f"\n📁 存在的文件夹 ({len(self.results['folders_found'])}个):", 'green'))
@@ -461,6 +1122,8 @@ class SystemSearcher:
                           f"{ColorfulProgressBar.color_text(f'{folder}', 'cyan')} "
                           f"{ColorfulProgressBar.color_text('→', 'white')} "
                           f"{ColorfulProgressBar.color_text(f'{path}', 'yellow')}")
+                    if self.show_metadata:
+                        print(f"       {ColorfulProgressBar.color_text(self.format_metadata(self.metadata.get(path)), 'white')}")
                 if len(self.results['folders_found']) > 10:
                     print(f"  {ColorfulProgressBar.color_text(f'... 还有 {len(self.results["folders_found"]) - 10} 个文件夹', 'white')}")
             else:
@@ -474,6 +1137,8 @@ class SystemSearcher:
                           f"{ColorfulProgressBar.color_text(f'{file}', 'cyan')} "
                           f"{ColorfulProgressBar.color_text('→', 'white')} "
                           f"{ColorfulProgressBar.color_text(f'{path}', 'yellow')}")
+                    if self.show_metadata:
+                        print(f"       {ColorfulProgressBar.color_text(self.format_metadata(self.metadata.get(path)), 'white')}")
                 if len(self.results['files_found']) > 10:
                     print(f"  {ColorfulProgressBar.color_text(f'... 还有 {len(self.results["files_found"]) - 10} 个文件', 'white')}")
             else:
@@ -482,7 +1147,8 @@ class SystemSearcher:
     def display_results(self):
         """显示所有结果"""
         # 显示不存在的项目
-        if self.results['folders_not_found'] or self.results['files_not_found']:
+        if (self.results['folders_not_found'] or self.results['files_not_found']
+                or self.results['folders_filtered_out'] or self.results['files_filtered_out']):
             show_not_found = input(ColorfulProgressBar.color_text(f"\n是否显示不存在的项目列表？(y/n, 回车默认y): ", 'yellow')).strip().lower()
             if show_not_found != 'n':
                 self.display_detailed_results()
@@ -494,6 +1160,10 @@ class SystemSearcher:
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         output_file = f"search_results_{timestamp}.txt"
         
+        # 需要写入元数据时，一次性分批读取所有命中项
+        if self.show_metadata:
+            self.load_metadata([path for _, path in self.results['folders_found'] + self.results['files_found']])
+        
         try:
             # 使用utf-8编码保存文件，处理中文字符
             with open(output_file, 'w', encoding='utf-8') as f:
@@ -501,6 +1171,8 @@ class SystemSearcher:
                 f.write("="*70 + "\n")
                 f.write(f"搜索目录: {self.target_path}\n")
                 f.write(f"搜索时间: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+                if self.metadata_filter is not None and self.metadata_filter.active:
+                    f.write(f"过滤条件: {self.metadata_filter.describe()}\n")
                 f.write("\n")
                 
                 # 写入目录内容
@@ -525,6 +1197,7 @@ class SystemSearcher:
                 # 文件夹统计
                 folders_found = len(self.results['folders_found'])
                 folders_not_found = len(self.results['folders_not_found'])
+                folders_filtered_out = len(self.results['folders_filtered_out'])
                 folders_total = len(self.folders)
                 
                 f.write("文件夹统计:\n")
@@ -532,7 +1205,10 @@ class SystemSearcher:
                 # 修复除零错误
                 if folders_total > 0:
                     f.write(f"  存在的: {folders_found} ({folders_found/folders_total*100:.1f}%)\n")
-                    f.write(f"  不存在的: {folders_not_found} ({folders_not_found/folders_total*100:.1f}%)\n\n")
+                    f.write(f"  不存在的: {folders_not_found} ({folders_not_found/folders_total*100:.1f}%)\n")
+                    if folders_filtered_out:
+                        f.write(f"  存在但不满足过滤条件: {folders_filtered_out} ({folders_filtered_out/folders_total*100:.1f}%)\n")
+                    f.write("\n")
                 else:
                     f.write(f"  存在的: {folders_found} (0%)\n")
                     f.write(f"  不存在的: {folders_not_found} (0%)\n\n")
@@ -540,6 +1216,7 @@ class SystemSearcher:
                 # 文件统计
                 files_found = len(self.results['files_found'])
                 files_not_found = len(self.results['files_not_found'])
+                files_filtered_out = len(self.results['files_filtered_out'])
                 files_total = len(self.files)
                 
                 f.write("文件统计:\n")
@@ -547,7 +1224,10 @@ class SystemSearcher:
                 # 修复除零错误
                 if files_total > 0:
                     f.write(f"  存在的: {files_found} ({files_found/files_total*100:.1f}%)\n")
-                    f.write(f"  不存在的: {files_not_found} ({files_not_found/files_total*100:.1f}%)\n\n")
+                    f.write(f"  不存在的: {files_not_found} ({files_not_found/files_total*100:.1f}%)\n")
+                    if files_filtered_out:
+                        f.write(f"  存在但不满足过滤条件: {files_filtered_out} ({files_filtered_out/files_total*100:.1f}%)\n")
+                    f.write("\n")
                 else:
                     f.write(f"  存在的: {files_found} (0%)\n")
                     f.write(f"  不存在的: {files_not_found} (0%)\n\n")
@@ -555,6 +1235,7 @@ class SystemSearcher:
                 # 总体统计
                 total_found = folders_found + files_found
                 total_not_found = folders_not_found + files_not_found
+                total_filtered_out = folders_filtered_out + files_filtered_out
                 total_items = folders_total + files_total
                 
                 f.write("总体统计:\n")
@@ -562,17 +1243,33 @@ class SystemSearcher:
                 # 修复除零错误
                 if total_items > 0:
                     f.write(f"  存在的: {total_found} ({total_found/total_items*100:.1f}%)\n")
-                    f.write(f"  不存在的: {total_not_found} ({total_not_found/total_items*100:.1f}%)\n\n")
+                    f.write(f"  不存在的: {total_not_found} ({total_not_found/total_items*100:.1f}%)\n")
+                    if total_filtered_out:
+                        f.write(f"  存在但不满足过滤条件: {total_filtered_out} ({total_filtered_out/total_items*100:.1f}%)\n")
+                    f.write("\n")
                 else:
                     f.write(f"  存在的: {total_found} (0%)\n")
                     f.write(f"  不存在的: {total_not_found} (0%)\n\n")
                 
+                # 写入设备并发统计
+                if self.device_stats:
+                    f.write("设备并发统计:\n")
+                    for device_stat in self.device_stats:
+                        f.write(f"  设备 {device_stat['device']}: {'; '.join(device_stat['roots'])}\n")
+                        f.write(f"    有效并发: {device_stat['effective_concurrency']:.2f} "
+                                f"(最终 {device_stat['final_concurrency']}, 峰值 {device_stat['peak_concurrency']}, 上限 {device_stat['max_workers']})\n")
+                        f.write(f"    scandir: {device_stat['scandir_calls']} 次, 平均延迟 {device_stat['avg_latency_ms']:.2f} ms, "
+                                f"吞吐量 {device_stat['throughput']:.1f} 项/秒\n")
+                    f.write("\n")
+                
                 # 写入不存在的文件夹
                 if self.results['folders_not_found']:
                     f.write("不存在的文件夹:\n")
                     for folder in self.results['folders_not_found']:
                         folder_str = str(folder)
                         f.write(f"  - {folder_str}\n")
+                        for candidate, distance, path in self.near_matches['folders'].get(folder, []):
+                            f.write(f"      ≈ {candidate} (距离 {distance}, 位置: {path})\n")
                     f.write("\n")
                 
                 # 写入不存在的文件
@@ -581,8 +1278,19 @@ class SystemSearcher:
                     for file in self.results['files_not_found']:
                         file_str = str(file)
                         f.write(f"  - {file_str}\n")
+                        for candidate, distance, path in self.near_matches['files'].get(file, []):
+                            f.write(f"      ≈ {candidate} (距离 {distance}, 位置: {path})\n")
                     f.write("\n")
                 
+                # 写入存在但不满足过滤条件的项目
+                for key, title in (('folders_filtered_out', "存在但不满足过滤条件的文件夹"),
+                                   ('files_filtered_out', "存在但不满足过滤条件的文件")):
+                    if self.results[key]:
+                        f.write(f"{title}:\n")
+                        for name, path in self.results[key]:
+                            f.write(f"  - {name} (位置: {path})\n")
+                        f.write("\n")
+                
                 # 写入存在的文件夹
                 if self.results['folders_found']:
                     f.write("存在的文件夹:\n")
@@ -590,6 +1298,8 @@ class SystemSearcher:
                         folder_str = str(folder)
                         path_str = str(path)
                         f.write(f"  - {folder_str} (位置: {path_str})\n")
+                        if self.show_metadata:
+                            f.write(f"      {self.format_metadata(self.metadata.get(path))}\n")
                     f.write("\n")
                 
                 # 写入存在的文件
@@ -599,6 +1309,8 @@ class SystemSearcher:
                         file_str = str(file)
                         path_str = str(path)
                         f.write(f"  - {file_str} (位置: {path_str})\n")
+                        if self.show_metadata:
+                            f.write(f"      {self.format_metadata(self.metadata.get(path))}\n")
             
             print(ColorfulProgressBar.color_text(f"\n✅ 结果已保存到: ", 'green') + 
                   ColorfulProgressBar.color_text(f"{os.path.abspath(output_file)}", 'cyan'))
@@ -625,6 +1337,266 @@ class SystemSearcher:
             print(ColorfulProgressBar.color_text(f"保存文件时出错: {e}", 'red'))
             return False
 
+class SortedTreeWalker:
+    """按相对路径顺序流式遍历目录树，内存占用只与目录深度和单层宽度有关"""
+    
+    def __init__(self, root, with_stat=False):
+        self.root = str(root)
+        self.with_stat = with_stat
+        self.case_insensitive = os.name == 'nt'
+        self.errors = 0
+        self.current = None
+        self._stack = [self._listing(self.root, (), '')]
+        self.advance(descend=False)
+    
+    def _listing(self, path, key_parts, rel_prefix):
+        """读取单个目录并按名称排序，返回条目迭代器"""
+        records = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        is_dir = False
+                    size = mtime = None
+                    if self.with_stat:
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                            size, mtime = st.st_size, st.st_mtime
+                        except OSError:
+                            pass
+                    key = entry.name.casefold() if self.case_insensitive else entry.name
+                    records.append({
+                        'key': key_parts + (key,),
+                        'rel_path': rel_prefix + entry.name,
+                        'path': entry.path,
+                        'is_dir': is_dir,
+                        'size': size,
+                        'mtime': mtime,
+                    })
+        except OSError:
+            self.errors += 1  # 跳过没有权限的目录
+        records.sort(key=lambda record: record['key'][-1])
+        return iter(records)
+    
+    def advance(self, descend=True):
+        """移动到下一个条目；descend为False时跳过当前文件夹的子项"""
+        current = self.current
+        if descend and current is not None and current['is_dir']:
+            self._stack.append(self._listing(current['path'], current['key'],
+                                             current['rel_path'] + os.sep))
+        while self._stack:
+            record = next(self._stack[-1], None)
+            if record is not None:
+                self.current = record
+                return record
+            self._stack.pop()
+        self.current = None
+        return None
+
+class DirectoryComparer:
+    """目录对比：找出目录A中在镜像/备份目录B里缺失、多余或类型不同的条目"""
+    
+    def __init__(self, source_path, mirror_path, compare_size=False, compare_mtime=False, mtime_tolerance=2.0):
+        self.source_path = Path(source_path)
+        self.mirror_path = Path(mirror_path)
+        self.compare_size = compare_size
+        self.compare_mtime = compare_mtime
+        self.mtime_tolerance = mtime_tolerance  # FAT等文件系统的时间精度为2秒
+        self.compared = 0
+        self.errors = 0
+        self.results = {
+            'missing': [],          # A中有、B中没有
+            'extra': [],            # B中有、A中没有
+            'type_mismatch': [],    # 同名但一个是文件夹一个是文件
+            'size_mismatch': [],
+            'mtime_mismatch': []
+        }
+    
+    def compare(self):
+        """同时有序遍历两棵目录树，单次归并得出差异"""
+        for path in (self.source_path, self.mirror_path):
+            if not path.exists():
+                raise FileNotFoundError(ColorfulProgressBar.color_text(f"错误: 路径 '{path}' 不存在", 'red'))
+            if not path.is_dir():
+                raise NotADirectoryError(ColorfulProgressBar.color_text(f"错误: '{path}' 不是文件夹", 'red'))
+        
+        print(ColorfulProgressBar.color_text(f"🔀 正在对比: ", 'green') +
+              ColorfulProgressBar.color_text(str(self.source_path), 'cyan') +
+              ColorfulProgressBar.color_text(" ⇄ ", 'white') +
+              ColorfulProgressBar.color_text(str(self.mirror_path), 'cyan'))
+        
+        start_time = time.time()
+        with_stat = self.compare_size or self.compare_mtime
+        source = SortedTreeWalker(self.source_path, with_stat)
+        mirror = SortedTreeWalker(self.mirror_path, with_stat)
+        
+        while source.current is not None or mirror.current is not None:
+            a, b = source.current, mirror.current
+            if b is None or (a is not None and a['key'] < b['key']):
+                # 缺失的文件夹只报告一次，不再展开其子项
+                self.results['missing'].append((a['rel_path'], a['is_dir']))
+                source.advance(descend=False)
+            elif a is None or b['key'] < a['key']:
+                self.results['extra'].append((b['rel_path'], b['is_dir']))
+                mirror.advance(descend=False)
+            else:
+                if a['is_dir'] != b['is_dir']:
+                    self.results['type_mismatch'].append((a['rel_path'], a['is_dir'], b['is_dir']))
+                    source.advance(descend=False)
+                    mirror.advance(descend=False)
+                else:
+                    if not a['is_dir']:
+                        self.compare_metadata(a, b)
+                    source.advance()
+                    mirror.advance()
+            
+            self.compared += 1
+            if self.compared % 1000 == 0:
+                sys.stdout.write(f"\r{ColorfulProgressBar.color_text('已对比', 'cyan')}: "
+                                 f"{ColorfulProgressBar.color_text(str(self.compared), 'yellow')} 项")
+                sys.stdout.flush()
+        
+        self.errors = source.errors + mirror.errors
+        ColorfulProgressBar.complete_progress("目录对比", self.compared, 'green')
+        self.display_statistics(start_time, time.time())
+        return self.results
+    
+    def compare_metadata(self, a, b):
+        """比较同名文件的大小和修改时间"""
+        if self.compare_size and a['size'] is not None and b['size'] is not None and a['size'] != b['size']:
+            self.results['size_mismatch'].append((a['rel_path'], a['size'], b['size']))
+        if (self.compare_mtime and a['mtime'] is not None and b['mtime'] is not None
+                and abs(a['mtime'] - b['mtime']) > self.mtime_tolerance):
+            self.results['mtime_mismatch'].append((a['rel_path'], a['mtime'], b['mtime']))
+    
+    def display_statistics(self, start_time, end_time):
+        """显示对比统计信息"""
+        print(ColorfulProgressBar.color_text("\n" + "="*70, 'cyan'))
+        print(ColorfulProgressBar.color_text("📊 对比完成 - 统计信息", 'yellow'))
+        print(ColorfulProgressBar.color_text("="*70, 'cyan'))
+        
+        compare_time = f"{end_time - start_time:.2f} 秒"
+        print(f"\n{ColorfulProgressBar.color_text('⏱️  对比耗时:', 'green')} {ColorfulProgressBar.color_text(compare_time, 'cyan')}")
+        print(f"{ColorfulProgressBar.color_text('已对比条目:', 'green')} {ColorfulProgressBar.color_text(str(self.compared), 'cyan')}")
+        print(f"{ColorfulProgressBar.color_text('❌ B中缺失:', 'red')} {ColorfulProgressBar.color_text(str(len(self.results['missing'])), 'cyan')}")
+        print(f"{ColorfulProgressBar.color_text('➕ B中多余:', 'yellow')} {ColorfulProgressBar.color_text(str(len(self.results['extra'])), 'cyan')}")
+        print(f"{ColorfulProgressBar.color_text('⚠️  类型不同:', 'magenta')} {ColorfulProgressBar.color_text(str(len(self.results['type_mismatch'])), 'cyan')}")
+        if self.compare_size:
+            print(f"{ColorfulProgressBar.color_text('📏 大小不同:', 'magenta')} {ColorfulProgressBar.color_text(str(len(self.results['size_mismatch'])), 'cyan')}")
+        if self.compare_mtime:
+            print(f"{ColorfulProgressBar.color_text('🕒 修改时间不同:', 'magenta')} {ColorfulProgressBar.color_text(str(len(self.results['mtime_mismatch'])), 'cyan')}")
+        if self.errors:
+            print(f"{ColorfulProgressBar.color_text('无法读取的目录:', 'red')} {ColorfulProgressBar.color_text(str(self.errors), 'cyan')}")
+        
+        print(ColorfulProgressBar.color_text("\n" + "="*70, 'cyan'))
+    
+    def display_results(self):
+        """显示差异列表"""
+        sections = [
+            ('missing', "❌ B中缺失的条目", 'red'),
+            ('extra', "➕ B中多余的条目", 'yellow'),
+            ('type_mismatch', "⚠️  类型不同的条目", 'magenta'),
+        ]
+        if self.compare_size:
+            sections.append(('size_mismatch', "📏 大小不同的文件", 'magenta'))
+        if self.compare_mtime:
+            sections.append(('mtime_mismatch', "🕒 修改时间不同的文件", 'magenta'))
+        
+        for key, title, color in sections:
+            items = self.results[key]
+            print(ColorfulProgressBar.color_text(f"\n{title} ({len(items)}个):", color))
+            for i, item in enumerate(items, 1):
+                print(f"  {ColorfulProgressBar.color_text(f'{i:3}.', 'white')} {ColorfulProgressBar.color_text(self.format_item(key, item), color)}")
+    
+    @staticmethod
+    def format_item(key, item):
+        """格式化单条差异"""
+        if key in ('missing', 'extra'):
+            rel_path, is_dir = item
+            return f"{'📁' if is_dir else '📄'} {rel_path}"
+        if key == 'type_mismatch':
+            rel_path, a_is_dir, b_is_dir = item
+            return f"{rel_path} (A: {'文件夹' if a_is_dir else '文件'}, B: {'文件夹' if b_is_dir else '文件'})"
+        if key == 'size_mismatch':
+            rel_path, a_size, b_size = item
+            return f"{rel_path} (A: {a_size} 字节, B: {b_size} 字节)"
+        rel_path, a_mtime, b_mtime = item
+        return (f"{rel_path} (A: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(a_mtime))}, "
+                f"B: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(b_mtime))})")
+    
+    def save_results(self):
+        """保存对比结果到文件"""
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        output_file = f"compare_results_{timestamp}.txt"
+        titles = {
+            'missing': "B中缺失的条目",
+            'extra': "B中多余的条目",
+            'type_mismatch': "类型不同的条目",
+            'size_mismatch': "大小不同的文件",
+            'mtime_mismatch': "修改时间不同的文件",
+        }
+        
+        try:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write("目录对比报告\n")
+                f.write("="*70 + "\n")
+                f.write(f"目录A: {self.source_path}\n")
+                f.write(f"目录B: {self.mirror_path}\n")
+                f.write(f"对比时间: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+                f.write(f"已对比条目: {self.compared}\n\n")
+                
+                for key, title in titles.items():
+                    items = self.results[key]
+                    if not items:
+                        continue
+                    f.write(f"{title} ({len(items)}个):\n")
+                    for item in items:
+                        f.write(f"  - {self.format_item(key, item)}\n")
+                    f.write("\n")
+            
+            print(ColorfulProgressBar.color_text(f"\n✅ 结果已保存到: ", 'green') + 
+                  ColorfulProgressBar.color_text(f"{os.path.abspath(output_file)}", 'cyan'))
+            return True
+        except Exception as e:
+            print(ColorfulProgressBar.color_text(f"保存文件时出错: {e}", 'red'))
+            return False
+
+def configure_mode():
+    """选择工作模式"""
+    print(ColorfulProgressBar.color_text(f"\n工作模式:", 'green'))
+    print(f"  {ColorfulProgressBar.color_text('1.', 'cyan')} {ColorfulProgressBar.color_text('在系统中搜索目录内的项目', 'white')} {ColorfulProgressBar.color_text('(默认)', 'yellow')}")
+    print(f"  {ColorfulProgressBar.color_text('2.', 'cyan')} {ColorfulProgressBar.color_text('与镜像/备份目录对比', 'white')}")
+    
+    choice = input(ColorfulProgressBar.color_text(f"\n请选择工作模式 (1-2, 回车默认1): ", 'yellow')).strip()
+    return 'compare' if choice == '2' else 'search'
+
+def configure_compare():
+    """配置目录对比选项"""
+    mirror_directory = input(ColorfulProgressBar.color_text(f"请输入要对比的镜像/备份目录路径: ", 'yellow')).strip()
+    compare_size = input(ColorfulProgressBar.color_text(f"  是否比较文件大小？(y/n, 回车默认n): ", 'yellow')).strip().lower()
+    compare_mtime = input(ColorfulProgressBar.color_text(f"  是否比较修改时间？(y/n, 回车默认n): ", 'yellow')).strip().lower()
+    return mirror_directory, compare_size == 'y', compare_mtime == 'y'
+
+def run_compare(target_directory):
+    """执行目录对比模式"""
+    mirror_directory, compare_size, compare_mtime = configure_compare()
+    if not mirror_directory:
+        print(ColorfulProgressBar.color_text(f"未输入对比目录，已取消", 'yellow'))
+        return
+    
+    comparer = DirectoryComparer(target_directory, mirror_directory, compare_size, compare_mtime)
+    comparer.compare()
+    
+    show_diff = input(ColorfulProgressBar.color_text(f"\n是否显示差异列表？(y/n, 回车默认y): ", 'yellow')).strip().lower()
+    if show_diff != 'n':
+        comparer.display_results()
+    
+    save_choice = input(ColorfulProgressBar.color_text(f"\n是否将结果保存到文件？(y/n, 回车默认y): ", 'yellow')).strip().lower()
+    if save_choice != 'n':
+        comparer.save_results()
+
 def configure_search():
     """配置搜索选项"""
     print(ColorfulProgressBar.color_text("\n" + "="*70, 'cyan'))
@@ -671,8 +1643,54 @@ def configure_display_options():
     
     show_search_paths = input(ColorfulProgressBar.color_text(f"  是否显示搜索路径？(y/n, 回车默认y): ", 'yellow')).strip().lower()
     show_search_items = input(ColorfulProgressBar.color_text(f"  是否显示正在搜索的项目？(y/n, 回车默认y): ", 'yellow')).strip().lower()
+    show_metadata = input(ColorfulProgressBar.color_text(f"  是否在结果中显示大小和修改时间？(y/n, 回车默认n): ", 'yellow')).strip().lower()
     
-    return show_search_paths != 'n', show_search_items != 'n'
+    return show_search_paths != 'n', show_search_items != 'n', show_metadata == 'y'
+
+def configure_filter_options():
+    """配置类型/大小/修改时间过滤条件"""
+    print(ColorfulProgressBar.color_text(f"\n过滤条件 (直接回车表示不限):", 'green'))
+    
+    def read_number(prompt, allow_zero=True):
+        value = input(ColorfulProgressBar.color_text(prompt, 'yellow')).strip()
+        if not value:
+            return None
+        try:
+            number = float(value)
+        except ValueError:
+            number = None
+        if number is None or number < 0 or (number == 0 and not allow_zero):
+            print(ColorfulProgressBar.color_text(f"  无效的数字 '{value}'，已忽略", 'red'))
+            return None
+        return number
+    
+    kind = input(ColorfulProgressBar.color_text(f"  类型 (1=仅文件, 2=仅文件夹, 回车不限): ", 'yellow')).strip()
+    min_size_mb = read_number(f"  最小大小 (MB): ")
+    max_size_mb = read_number(f"  最大大小 (MB): ")
+    modified_within_days = read_number(f"  最近多少天内修改: ", allow_zero=False)
+    
+    try:
+        metadata_filter = MetadataFilter(
+            kind={'1': 'file', '2': 'dir'}.get(kind),
+            min_size=int(min_size_mb * 1024 * 1024) if min_size_mb is not None else None,
+            max_size=int(max_size_mb * 1024 * 1024) if max_size_mb is not None else None,
+            modified_within_days=modified_within_days
+        )
+    except ValueError as e:
+        print(ColorfulProgressBar.color_text(f"  过滤条件无效: {e}，将不使用过滤条件", 'red'))
+        return None
+    return metadata_filter if metadata_filter.active else None
+
+def configure_fuzzy_options():
+    """配置模糊匹配选项"""
+    print(ColorfulProgressBar.color_text(f"\n模糊匹配:", 'green'))
+    
+    enable = input(ColorfulProgressBar.color_text(f"  是否为不存在的项目查找相似名称？(y/n, 回车默认n): ", 'yellow')).strip().lower()
+    if enable != 'y':
+        return False, 5
+    
+    top_k = input(ColorfulProgressBar.color_text(f"  每个项目显示的相似名称数量 (回车默认5): ", 'yellow')).strip()
+    return True, int(top_k) if top_k.isdigit() and int(top_k) > 0 else 5
 
 def main():
     print(ColorfulProgressBar.color_text("="*70, 'cyan'))
@@ -688,6 +1706,11 @@ def main():
               ColorfulProgressBar.color_text(f"{target_directory}", 'cyan'))
     
     try:
+        # 目录对比模式
+        if configure_mode() == 'compare':
+            run_compare(target_directory)
+            return
+        
         # 创建搜索器
         searcher = SystemSearcher(target_directory)
         
@@ -697,9 +1720,16 @@ def main():
             searcher.search_roots = search_roots
         
         # 配置显示选项
-        show_search_paths, show_search_items = configure_display_options()
+        show_search_paths, show_search_items, show_metadata = configure_display_options()
         searcher.show_search_paths = show_search_paths
         searcher.show_search_items = show_search_items
+        searcher.show_metadata = show_metadata
+        
+        # 配置过滤条件
+        searcher.metadata_filter = configure_filter_options()
+        
+        # 配置模糊匹配选项
+        searcher.fuzzy_enabled, searcher.fuzzy_top_k = configure_fuzzy_options()
         
         # 收集目标项目
         searcher.collect_target_items()
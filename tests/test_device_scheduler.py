@@ -0,0 +1,132 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file import DeviceConcurrencyController, DeviceScheduler, SystemSearcher
+
+
+class FakeClock:
+    """可手动推进的时钟"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def make_controller(clock, max_workers=16):
+    controller = DeviceConcurrencyController('dev', ['root'], max_workers=max_workers, clock=clock)
+    controller.start()
+    return controller
+
+
+def run_window(controller, clock, throughput, latency_per_entry):
+    """用满当前并发上限运行一个窗口，按给定吞吐量和单项延迟释放槽位"""
+    limit = controller.limit
+    for _ in range(limit):
+        controller.acquire()
+    entries = max(1, int(throughput * controller.WINDOW_SECONDS / limit))
+    for i in range(limit):
+        if i == limit - 1:
+            clock.now += controller.WINDOW_SECONDS
+        controller.release(latency_per_entry * entries, entries)
+
+
+def run_device(controller, clock, device, windows):
+    limits = []
+    for window in range(windows):
+        throughput, latency_per_entry = device(controller.limit, window)
+        run_window(controller, clock, throughput, latency_per_entry)
+        limits.append(controller.limit)
+    return limits
+
+
+def scaling_device(limit, window):
+    """吞吐量随并发线性增长到8（类似NVMe），单项延迟不变"""
+    return 1000.0 * min(limit, 8), 0.0005
+
+
+def seeking_device(limit, window):
+    """并发越高寻道越多、吞吐量越低（类似机械硬盘），延迟随并发上升"""
+    return 1000.0 / (1 + 0.3 * (limit - 1)), 0.0005 * limit
+
+
+def warm_then_cold_device(limit, window):
+    """前4个窗口命中页缓存（延迟极低且与并发无关），之后与scaling_device相同"""
+    if window < 4:
+        return 50000.0, 0.00001
+    return scaling_device(limit, window)
+
+
+def test_limit_converges_upward_on_scaling_device():
+    clock = FakeClock()
+    controller = make_controller(clock)
+    limits = run_device(controller, clock, scaling_device, 80)
+    assert min(limits[-20:]) >= 7
+    assert max(limits[-20:]) <= 9
+
+
+def test_limit_converges_downward_on_seeking_device():
+    clock = FakeClock()
+    controller = make_controller(clock)
+    limits = run_device(controller, clock, seeking_device, 80)
+    assert max(limits[-20:]) <= 2
+    assert sum(limits[-20:]) / 20 < 1.5
+
+
+def test_limit_recovers_after_cache_warm_windows():
+    clock = FakeClock()
+    controller = make_controller(clock)
+    limits = run_device(controller, clock, warm_then_cold_device, 120)
+    assert min(limits[-20:]) >= 7
+
+
+def test_effective_concurrency_reports_slots_in_use_not_cap():
+    clock = FakeClock()
+    controller = make_controller(clock)
+    controller.acquire()
+    controller.acquire()
+    clock.now = 1.0
+    controller.release(0.001, 1)
+    controller.release(0.001, 1)
+    # 之后只有一个任务在运行，上限不会因此下降
+    controller.acquire()
+    clock.now = 2.0
+    controller.release(0.001, 1)
+    clock.now = 4.0
+    controller.shutdown()
+    stats = controller.stats()
+    assert stats['effective_concurrency'] == 3.0 / 4.0
+    assert stats['final_concurrency'] >= 2
+
+
+def test_interrupt_stops_running_walks_and_cancels_queued_tasks(tmp_path):
+    searcher = SystemSearcher(tmp_path)
+    searcher.show_search_items = False
+    names = ['first'] + [f'slow{i}' for i in range(20)]
+    started = []
+    lock = threading.Lock()
+    
+    def fake_search(name, thread_id, roots, controller, stop_event):
+        with lock:
+            started.append(name)
+        if name != 'first':
+            # 模拟一次很长的全盘遍历，只有stop_event能让它提前结束
+            stop_event.wait(10)
+        return False, None
+    
+    start = time.time()
+    with pytest.raises(KeyboardInterrupt):
+        with DeviceScheduler([str(tmp_path)], max_workers=2) as scheduler:
+            results = searcher.schedule_device_search(scheduler, names, fake_search, '📄')
+            assert next(results) == ('first', False, None)
+            results.throw(KeyboardInterrupt)
+    
+    assert time.time() - start < 5
+    assert len(started) < len(names)
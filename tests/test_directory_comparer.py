@@ -0,0 +1,65 @@
+import contextlib
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file import DirectoryComparer, SortedTreeWalker
+
+
+def make_tree(root, files, folders=()):
+    for folder in folders:
+        (root / folder).mkdir(parents=True, exist_ok=True)
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def compare(source, mirror, **options):
+    comparer = DirectoryComparer(source, mirror, **options)
+    with contextlib.redirect_stdout(io.StringIO()):
+        comparer.compare()
+    return comparer.results
+
+
+def test_walker_yields_paths_in_sorted_order(tmp_path):
+    make_tree(tmp_path, {'b.txt': '', 'a/z.txt': '', 'a/y/x.txt': '', 'a.txt': ''})
+    walker = SortedTreeWalker(tmp_path)
+    rel_paths = []
+    while walker.current is not None:
+        rel_paths.append(walker.current['rel_path'])
+        walker.advance()
+    
+    assert rel_paths == ['a', os.path.join('a', 'y'), os.path.join('a', 'y', 'x.txt'),
+                         os.path.join('a', 'z.txt'), 'a.txt', 'b.txt']
+
+
+def test_reports_missing_extra_and_type_mismatch(tmp_path):
+    source = tmp_path / 'A'
+    mirror = tmp_path / 'B'
+    make_tree(source, {'same/f.txt': '', 'only_a.txt': '', 'gone/deep/x.txt': '', 'kind/inner.txt': ''})
+    make_tree(mirror, {'same/f.txt': '', 'only_b.txt': '', 'kind': ''})
+    
+    results = compare(source, mirror)
+    
+    # 缺失的文件夹只报告一次，不展开子项
+    assert results['missing'] == [('gone', True), ('only_a.txt', False)]
+    assert results['extra'] == [('only_b.txt', False)]
+    assert results['type_mismatch'] == [('kind', True, False)]
+
+
+def test_optional_size_and_mtime_comparison(tmp_path):
+    source = tmp_path / 'A'
+    mirror = tmp_path / 'B'
+    make_tree(source, {'size.txt': 'abc', 'time.txt': 'same'})
+    make_tree(mirror, {'size.txt': 'abcdef', 'time.txt': 'same'})
+    os.utime(source / 'time.txt', (1000000, 1000000))
+    os.utime(mirror / 'time.txt', (2000000, 2000000))
+    
+    assert compare(source, mirror)['size_mismatch'] == []
+    
+    results = compare(source, mirror, compare_size=True, compare_mtime=True)
+    assert results['size_mismatch'] == [('size.txt', 3, 6)]
+    assert [item[0] for item in results['mtime_mismatch']] == ['time.txt']
@@ -0,0 +1,94 @@
+import contextlib
+import io
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file import MetadataFilter, SystemSearcher
+
+
+def write_file(path, size, age_days=0):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b'\0' * size)
+    if age_days:
+        mtime = time.time() - age_days * 86400
+        os.utime(path, (mtime, mtime))
+
+
+def entries_of(directory):
+    with os.scandir(directory) as it:
+        return {entry.name: entry for entry in it}
+
+
+def run_search(target, roots, metadata_filter):
+    searcher = SystemSearcher(target)
+    searcher.search_roots = [str(root) for root in roots]
+    searcher.show_search_paths = False
+    searcher.show_search_items = False
+    searcher.metadata_filter = metadata_filter
+    with contextlib.redirect_stdout(io.StringIO()):
+        searcher.collect_target_items()
+        searcher.search_items_parallel()
+    return searcher
+
+
+def test_matches_type_size_and_mtime(tmp_path):
+    write_file(tmp_path / 'big.bin', 2048)
+    write_file(tmp_path / 'small.txt', 10)
+    write_file(tmp_path / 'old.bin', 2048, age_days=60)
+    (tmp_path / 'folder').mkdir()
+    entries = entries_of(tmp_path)
+    
+    big_recent_files = MetadataFilter(kind='file', min_size=1024, modified_within_days=30)
+    assert [name for name in sorted(entries) if big_recent_files.matches(entries[name])] == ['big.bin']
+    
+    folders_only = MetadataFilter(kind='dir')
+    assert [name for name in sorted(entries) if folders_only.matches(entries[name])] == ['folder']
+    
+    small_files = MetadataFilter(max_size=100)
+    assert [name for name in sorted(entries) if small_files.matches(entries[name])] == ['folder', 'small.txt']
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'min_size': -1},
+    {'max_size': -1},
+    {'min_size': 200, 'max_size': 100},
+    {'modified_within_days': 0},
+    {'modified_within_days': -3},
+    {'kind': 'link'},
+])
+def test_invalid_filters_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        MetadataFilter(**kwargs)
+
+
+def test_hit_failing_filter_is_filtered_out_not_missing(tmp_path):
+    target = tmp_path / 'target'
+    system = tmp_path / 'system'
+    write_file(target / 'f5.txt', 50)
+    write_file(target / 'missing.txt', 50)
+    write_file(system / 'sub' / 'f5.txt', 5)
+    
+    searcher = run_search(target, [system], MetadataFilter(kind='file', min_size=10))
+    
+    assert searcher.results['files_filtered_out'] == [('f5.txt', str(system / 'sub' / 'f5.txt'))]
+    assert searcher.results['files_not_found'] == ['missing.txt']
+    assert searcher.results['files_found'] == []
+
+
+def test_hit_passing_filter_elsewhere_counts_as_found(tmp_path):
+    target = tmp_path / 'target'
+    small_root = tmp_path / 'small'
+    large_root = tmp_path / 'large'
+    write_file(target / 'f5.txt', 50)
+    write_file(small_root / 'f5.txt', 5)
+    write_file(large_root / 'f5.txt', 60)
+    
+    searcher = run_search(target, [small_root, large_root], MetadataFilter(kind='file', min_size=10))
+    
+    assert searcher.results['files_found'] == [('f5.txt', str(large_root / 'f5.txt'))]
+    assert searcher.results['files_filtered_out'] == []
@@ -0,0 +1,65 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file import NGramIndex
+
+
+def edit_distance(a, b):
+    """完整动态规划，作为对照"""
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def test_bounded_edit_distance_matches_full_dp():
+    rng = random.Random(1)
+    for _ in range(5000):
+        a = ''.join(rng.choices('abc', k=rng.randint(0, 8)))
+        b = ''.join(rng.choices('abc', k=rng.randint(0, 8)))
+        limit = rng.randint(0, 5)
+        distance = edit_distance(a, b)
+        assert NGramIndex.bounded_edit_distance(a, b, limit) == (distance if distance <= limit else None)
+
+
+def test_renamed_versions_are_suggested():
+    index = NGramIndex()
+    for name in ['report_v2.docx', 'quarterly_report_2024_final.xlsx', 'unrelated.txt']:
+        index.add(name, f'/data/{name}')
+    
+    assert index.search('report.docx') == [('report_v2.docx', 3, '/data/report_v2.docx')]
+    assert [name for name, _, _ in index.search('quarterly_report_2024.xlsx')] == ['quarterly_report_2024_final.xlsx']
+
+
+def test_same_stem_with_other_extension_is_suggested():
+    index = NGramIndex()
+    for name in ['f1.md', 'f1.txt', 'f2.txt']:
+        index.add(name)
+    
+    assert [name for name, _, _ in index.search('f1.log')] == ['f1.md', 'f1.txt']
+
+
+def test_search_matches_exhaustive_scan():
+    rng = random.Random(2)
+    index = NGramIndex()
+    names = set()
+    for _ in range(800):
+        name = ''.join(rng.choices('abcde', k=rng.randint(1, 10))) + rng.choice(['.txt', '.md', ''])
+        names.add(name)
+        index.add(name)
+    
+    for _ in range(100):
+        query = ''.join(rng.choices('abcde', k=rng.randint(1, 10))) + rng.choice(['.txt', '.doc', ''])
+        limit = min(max(2, len(query) // 3), (len(index.grams(query)) - 1) // index.n)
+        stem = os.path.splitext(query)[0]
+        expected = sorted((edit_distance(query, name), name) for name in names
+                          if name != query and (edit_distance(query, name) <= limit
+                                                or (stem and os.path.splitext(name)[0] == stem)))
+        got = [(distance, name) for name, distance, _ in index.search(query, top_k=len(names))]
+        assert got == expected